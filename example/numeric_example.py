@@ -0,0 +1,27 @@
+from classtools import variantmethod
+
+
+class Kernel:
+    @variantmethod("add")
+    @staticmethod
+    def apply(x: float, y: float) -> float:
+        return x + y
+
+    @apply.register("mul")
+    @staticmethod
+    def _(x: float, y: float) -> float:
+        return x * y
+
+
+if __name__ == "__main__":
+    try:
+        Kernel.apply.compile_numeric()
+        Kernel.apply.compile_numeric() # already compiled variants are skipped
+    except ImportError as e:
+        print(f"{e}, running the Python variants")
+
+    k = Kernel()
+    print(k.apply(2.0, 3.0))
+    k.apply.set("mul")
+    print(k.apply(2.0, 3.0))
+    assert k.apply(2.0, 3.0) == 6.0
@@ -0,0 +1,38 @@
+from classtools import immutable_property, Signal
+
+
+class Mixin:
+    # A slotted mixin may declare properties; they are stored in the
+    # __dict__ of the concrete subclasses.
+    __slots__ = ()
+
+    changed = Signal(int)
+
+    @immutable_property
+    def history(self) -> list[int]:
+        return []
+
+
+class Concrete(Mixin):
+    def __init__(self):
+        self.changed.connect(self.history.append)
+
+
+class Slotted(Mixin):
+    __slots__ = ()
+
+
+if __name__ == "__main__":
+    c = Concrete()
+    c.changed.emit(1)
+    c.changed.emit(2)
+    print("history:", c.history)
+    assert c.history == [1, 2]
+
+    # Instances without '__dict__' can not store the properties.
+    try:
+        Slotted().history
+    except TypeError as e:
+        print("TypeError:", e)
+    else:
+        raise AssertionError("expected TypeError")
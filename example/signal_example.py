@@ -0,0 +1,93 @@
+from classtools import Signal
+
+
+received: list[str] = []
+
+
+class Sensor:
+    measured = Signal(float)
+    tagged = Signal(list)
+    alarm = Signal()
+
+    def __init__(self, name: str):
+        self.name = name
+
+    @measured.bindm
+    def _show(self, val: float):
+        received.append(f"{self.name} show {val}")
+
+
+def log(val: float):
+    received.append(f"log {val}")
+
+
+def beep():
+    received.append("beep")
+
+
+def flash(self: Sensor):
+    received.append(f"{self.name} flash")
+
+
+if __name__ == "__main__":
+    s1 = Sensor("s1")
+    s2 = Sensor("s2")
+
+    # Callbacks bound to the signal are seen by existing instances too.
+    Sensor.measured.bindf(log)
+    s1.measured.emit(1.0)
+    print(received)
+    assert received == ["s1 show 1.0", "log 1.0"]
+
+    # Disconnecting a callback of the signal mutes it for that instance only,
+    # for method callbacks through the bound method.
+    received.clear()
+    s1.measured.disconnect(log)
+    s1.measured.disconnect(s1._show)
+    s1.measured.emit(2.0)
+    s2.measured.emit(3.0)
+    print(received)
+    assert received == ["s2 show 3.0", "log 3.0"]
+
+    # Callbacks whose signature can not be inspected, like some builtins,
+    # are called with the value.
+    tags: set[str] = set()
+    s1.tagged.connect(tags.update)
+    s1.tagged.emit(["hot", "wet"])
+    print(sorted(tags))
+    assert tags == {"hot", "wet"}
+
+    # A callable is connected at most once per instance.
+    received.clear()
+    s2.measured.connect(s1._show)
+    s2.measured.connect(s1._show)
+    s2.measured.emit(4.0)
+    print(received)
+    assert received == ["s2 show 4.0", "log 4.0", "s1 show 4.0"]
+
+    # Callbacks of the signal run in the order they were bound, whether
+    # they were bound as functions or as methods.
+    received.clear()
+    Sensor.alarm.bindf(beep)
+    Sensor.alarm.bindm(flash)
+    s1.alarm.emit()
+    print(received)
+    assert received == ["beep", "s1 flash"]
+
+    # Builtin bound methods are matched by their instance as well, so a
+    # fresh `list.append` disconnects the one connected before.
+    values: list[float] = []
+    s2.measured.connect(values.append)
+    s2.measured.emit(5.0)
+    s2.measured.disconnect(values.append)
+    s2.measured.emit(6.0)
+    print(values)
+    assert values == [5.0]
+
+    # The same holds when unbinding from the signal itself.
+    Sensor.measured.bindf(values.append)
+    s1.measured.emit(7.0)
+    Sensor.measured.unbindf(values.append)
+    s1.measured.emit(8.0)
+    print(values)
+    assert values == [5.0, 7.0]
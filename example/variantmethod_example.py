@@ -38,3 +38,13 @@ if __name__ == "__main__":
     e.changed.emit("mul")
     print(e.calculate(1, 2))
     print(e.calculate["div"](1, 2))
+
+    # Variants registered later also apply to existing instances, including
+    # the one currently selected.
+    @Example.calculate.register("mul")
+    def _(self, x, y):
+        return x * y * 10
+
+    print(e.calculate["div"](1, 2))
+    print(e.calculate(1, 2))
+    assert e.calculate(1, 2) == 20
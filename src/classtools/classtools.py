@@ -8,9 +8,32 @@ __all__ = [
     'declare'
 ]
 
+import functools
+import inspect
 import types
 from typing import overload, Concatenate, Protocol, Self, Any
-from collections.abc import Callable
+from collections.abc import Callable, Hashable, Iterable
+
+
+_MISSING = object()
+
+
+def _mangle(owner: type, name: str, /) -> str:
+    """Apply the private name mangling of `owner` to `name`, as done for the
+    names listed in `__slots__`."""
+    if name.startswith('__') and not name.endswith('__'):
+        prefix = owner.__name__.lstrip('_')
+        if prefix:
+            return f"_{prefix}{name}"
+    return name
+
+
+def _bind_method(func, obj, /) -> Callable[..., Any]:
+    """Bind `func` to `obj` like an attribute lookup would, constructing the
+    method directly for plain functions."""
+    if type(func) is types.FunctionType:
+        return types.MethodType(func, obj)
+    return func.__get__(obj, type(obj))
 
 
 ### Attribute
@@ -24,16 +47,40 @@ class immutable_property[T, VT]: # Similar to the cached_property in functools.p
 
     This type of property references cannot be changed after the first access,
     but can be deleted to reverted to the default value, and the referenced
-    objects can still be mutable."""
-    __slots__ = ('__name__', '_default', '_default_factory')
+    objects can still be mutable.
 
-    def __init__(self, fnew: Callable[[T], VT]) -> None:
+    By default the value is stored in the instance `__dict__`. Pass `slot` to
+    store it in a slot of the owner instead: either the name of the slot, or
+    True to use `__ip_<name>`. The owner must declare that name in its
+    `__slots__`."""
+    __slots__ = ('__name__', '_default', '_default_factory', '_factory_takes_obj', '_slot')
+
+    def __init__(self, fnew: Callable[[T], VT] | None, *, slot: str | bool = False) -> None:
         self.__name__ = None
         self._default_factory = fnew
+        self._factory_takes_obj = True
+        self._slot = slot
+
+    @classmethod
+    def from_zero_arg(cls, factory: Callable[[], VT], /, *, slot: str | bool = False) -> Self:
+        """Create the property from a factory that does not take the instance."""
+        prop = cls(factory, slot=slot) # type: ignore[arg-type]
+        prop._factory_takes_obj = False
+        return prop
 
     def __set_name__(self, owner: type[T], name: str, /):
         if self.__name__ is None:
             self.__name__ = name
+            if self._slot is True:
+                self._slot = _mangle(owner, f"__ip_{name}")
+            if self._slot and not any(
+                isinstance(c.__dict__.get(self._slot), types.MemberDescriptorType)
+                for c in owner.__mro__
+            ):
+                raise TypeError(
+                    f"{owner.__name__!r} has no slot {self._slot!r} "
+                    f"to save {name!r} property."
+                )
         elif name != self.__name__ and not name.startswith('_'):
             raise TypeError(
                 "Cannot assign the same attribute to two different names "
@@ -47,39 +94,76 @@ class immutable_property[T, VT]: # Similar to the cached_property in functools.p
     def __get__(self, obj, objtype, /):
         if obj is None:
             return self
-        assert self.__name__ is not None
 
-        storage = self._get_storage(obj)
+        slot = self._slot
+
+        if not slot:
+            name = self.__name__
+
+            try:
+                storage = obj.__dict__
+            except AttributeError as e:
+                raise self._no_dict_error(obj) from e
+
+            value = storage.get(name, _MISSING)
+
+            if value is _MISSING:
+                if name is None:
+                    raise TypeError(
+                        "Cannot use immutable_property instance without "
+                        "calling __set_name__ on it."
+                    )
+                value = self._make_default(obj)
+                storage[name] = value
 
-        if self.__name__ in storage:
-            return storage[self.__name__]
-        else:
-            value = self._default_factory.__get__(obj, objtype)()
-            storage[self.__name__] = value
             return value
 
+        value = getattr(obj, slot, _MISSING)
+
+        if value is _MISSING:
+            value = self._make_default(obj)
+            object.__setattr__(obj, slot, value)
+
+        return value
+
     def __set__(self, obj: T, value: VT, /) -> None:
         raise TypeError("can not assign to an immutable property")
 
-    def __delete__(self, obj: T, /) -> None:
-        storage = self._get_storage(obj)
+    def _make_default(self, obj: T, /) -> VT:
+        # Subclasses building their default themselves override this and
+        # pass None as the factory.
+        if self._factory_takes_obj:
+            return self._default_factory(obj) # type: ignore[misc]
+        return self._default_factory() # type: ignore[misc]
 
-        if self.__name__ in storage:
-            del storage[self.__name__]
+    def __delete__(self, obj: T, /) -> None:
+        if self._slot:
+            try:
+                object.__delattr__(obj, self._slot)
+            except AttributeError:
+                pass
+            return
 
-    def _get_storage(self, obj: T):
         try:
-            return obj.__dict__
+            storage = obj.__dict__
         except AttributeError as e:
-            raise TypeError(
-                f"No '__dict__' attribute on {type(obj).__name__!r} "
-                f"instance to save {self.__name__!r} property."
-            ) from e
+            raise self._no_dict_error(obj) from e
+
+        try:
+            del storage[self.__name__]
+        except KeyError:
+            pass
+
+    def _no_dict_error(self, obj: T, /) -> TypeError:
+        return TypeError(
+            f"No '__dict__' attribute on {type(obj).__name__!r} "
+            f"instance to save {self.__name__!r} property."
+        )
 
 
 def descriptor[**P, VT](factory: Callable[P, VT], /) -> Callable[P, immutable_property[Any, VT]]:
     def wrapper(*args, **kwargs):
-        return immutable_property(lambda _: factory(*args, **kwargs))
+        return immutable_property.from_zero_arg(functools.partial(factory, *args, **kwargs))
     return wrapper
 
 
@@ -88,39 +172,84 @@ def descriptor[**P, VT](factory: Callable[P, VT], /) -> Callable[P, immutable_pr
 # ------------------------------
 
 class _Variant[KT, T, **P, R]:
+    __slots__ = (
+        '_owner', '_vt_ref', 'curr_key', 'instance', '_bound', '_bound_cache',
+        '_version'
+    )
+
     def __init__(
         self,
         curr_key: KT,
         obj: T,
-        vt_ref: dict[KT, Callable[Concatenate[T, P], R]]
+        owner: "variantmethod[KT, T, P, R]"
     ):
-        self._vt_ref = vt_ref # read-only
+        self._owner = owner
+        self._vt_ref = owner.virtual_table # read-only
         self.curr_key = curr_key
         self.instance = obj
+        self._bound = None # implementation bound to the current key
+        self._bound_cache: dict[KT, Callable[P, R]] = {}
+        self._version = owner._version # table version of the cached bindings
 
     def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
-        try:
-            impl = self._vt_ref[self.curr_key]
-        except KeyError:
+        bound = self._bound
+
+        if bound is None or self._version != self._owner._version:
+            bound = self._bind()
+
+        if kwargs:
+            return bound(*args, **kwargs)
+
+        return bound(*args)
+
+    def _bind(self) -> Callable[P, R]:
+        bound = self._get_bound(self.curr_key)
+
+        if bound is None:
             raise AttributeError(f"no variant was registered by {self.curr_key}")
 
-        return impl.__get__(self.instance)(*args, **kwargs)
+        self._bound = bound
+        return bound
+
+    def _get_bound(self, key: KT, /) -> Callable[P, R] | None:
+        if self._version != self._owner._version:
+            self._bound = None
+            self._bound_cache.clear()
+            self._version = self._owner._version
+
+        bound = self._bound_cache.get(key)
+
+        if bound is None:
+            impl = self._vt_ref.get(key)
+
+            if impl is None:
+                return None
+
+            bound = _bind_method(impl, self.instance)
+            self._bound_cache[key] = bound
+
+        return bound
 
     def __len__(self) -> int:
         return len(self._vt_ref)
 
     def __getitem__(self, val: KT) -> Callable[P, R]:
-        func = self._vt_ref[val]
-        return func.__get__(self.instance)
+        bound = self._get_bound(val)
+
+        if bound is None:
+            raise KeyError(val)
+
+        return bound
 
     def __contains__(self, item: KT) -> bool:
         return item in self._vt_ref
 
     def set(self, val: KT, /) -> None:
         self.curr_key = val
+        self._bound = None
 
     def mapping(self):
-        return types.MappingProxyType(self._vt_ref)
+        return self._owner.mapping()
 
 
 class variantmethod[KT, T, **P, R](immutable_property[T, _Variant[KT, T, P, R]]):
@@ -161,6 +290,11 @@ class variantmethod[KT, T, **P, R](immutable_property[T, _Variant[KT, T, P, R]])
     my_obj.my_method["c"](42)
     ```
     """
+    # '__dict__' holds the per-instance __doc__, which can not be a slot as it
+    # conflicts with the class docstring.
+    __slots__ = (
+        'virtual_table', '_initial_key', '_mapping_cache', '_version', '__dict__'
+    )
     virtual_table: dict[KT, Callable[Concatenate[T, P], R]]
 
     @overload
@@ -174,98 +308,289 @@ class variantmethod[KT, T, **P, R](immutable_property[T, _Variant[KT, T, P, R]])
             return super().__new__(cls)
 
     def __init__(self, key: KT, func: Callable[Concatenate[T, P], R], /):
-        super().__init__(lambda obj: _Variant(key, obj, self.virtual_table))
+        super().__init__(None)
+        self._initial_key = key
+        self._version = 0 # bumped on every change of the table
         self.virtual_table = {key: func}
+        self._mapping_cache = None
         self.__doc__ = func.__doc__
 
     def __set__(self, instance: T, value):
         raise TypeError("can not assign to variant methods")
 
+    def _make_default(self, obj: T, /) -> _Variant[KT, T, P, R]:
+        return _Variant(self._initial_key, obj, self)
+
     def register(self, key: KT, /):
         def decorator(func: Callable) -> variantmethod[KT, T, P, R]:
             self.virtual_table[key] = func
+            self._version += 1
             return self
         return decorator
 
+    def mapping(self) -> types.MappingProxyType[KT, Callable[Concatenate[T, P], R]]:
+        """Return a read-only view of the registered variants."""
+        # The proxy is a live view of the table, so it never goes stale.
+        if self._mapping_cache is None:
+            self._mapping_cache = types.MappingProxyType(self.virtual_table)
+        return self._mapping_cache
+
+    def compile_numeric(self, signature=None, /, *, cache: bool = True) -> Self:
+        """JIT-compile the static variants with `numba.njit`.
+
+        Only variants registered as `staticmethod` are compiled, as nopython
+        mode can not take the owner instance; the other variants are left
+        untouched. Variants that are already compiled are skipped, so this can
+        be called again after registering more variants.
+
+        Parameters:
+            signature: Optional numba signature(s) passed to `numba.njit`.
+            cache (bool): Whether numba caches the compiled code on disk.
+
+        Raises:
+            ImportError: If numba is not installed.
+        """
+        try:
+            import numba
+            from numba.extending import is_jitted
+        except ImportError as e:
+            raise ImportError("compile_numeric() requires numba") from e
+
+        compiled = False
+
+        for key, func in self.virtual_table.items():
+            if isinstance(func, staticmethod) and not is_jitted(func.__func__):
+                jitted = numba.njit(signature, cache=cache)(func.__func__)
+                self.virtual_table[key] = staticmethod(jitted)
+                compiled = True
+
+        if compiled:
+            self._version += 1
+
+        return self
+
 
 # ------------------------------
 # Signal
 # ------------------------------
 
+def _takes_arg(func: Callable[..., Any], /) -> bool:
+    """Return whether the callback expects the emitted value."""
+    bound = type(func) is types.MethodType
+    code_owner = func.__func__ if bound else func # type: ignore[attr-defined]
+
+    # Read the code object of plain functions directly, unless the signature
+    # is overridden, e.g. by functools.wraps.
+    if (
+        type(code_owner) is types.FunctionType
+        and '__wrapped__' not in code_owner.__dict__
+        and '__signature__' not in code_owner.__dict__
+    ):
+        code = code_owner.__code__
+        if code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS):
+            return True
+        return code.co_argcount + code.co_kwonlyargcount > int(bound)
+
+    try:
+        return len(inspect.signature(func).parameters) > 0
+    except (TypeError, ValueError):
+        return True
+
+
+def _callback_key(func: Callable[..., Any], /) -> Hashable:
+    """Return an identity key for a callback.
+
+    Bound methods, including those of builtin types like `list.append`, are
+    created anew on each attribute access, so they are keyed by their instance
+    and function instead of their own identity."""
+    if isinstance(func, types.MethodType):
+        return (id(func.__self__), id(func.__func__))
+    if isinstance(func, (types.BuiltinMethodType, types.MethodWrapperType)):
+        owner = func.__self__
+        if owner is not None and not isinstance(owner, types.ModuleType):
+            return (id(owner), func.__name__)
+    return id(func)
+
+
 class _Emitter[VT]:
-    def __init__(self, obj, cb_m: list, cb_f: list):
+    __slots__ = (
+        'obj', '_signal', '_conn_cbs', '_conn_takes', '_bound_cache', '_muted',
+        '_funcs', '_takes', '_version'
+    )
+
+    def __init__(self, obj, signal: "Signal[Any, VT]"):
         self.obj = obj
-        self._cb_list = [func.__get__(self.obj, self.obj.__class__) for func in cb_m]
-        self._cb_list.extend(cb_f)
+        self._signal = signal
+        # callbacks connected to this instance, keyed by _callback_key
+        self._conn_cbs: dict[Hashable, Callable[..., Any]] = {}
+        self._conn_takes: dict[Hashable, bool] = {}
+        # (id(callback), bind) -> (callback, bound callable, takes arg), the
+        # callback is kept alive by the entry so that its id can not be reused.
+        self._bound_cache: dict[tuple[int, bool], tuple[Any, Callable[..., Any], bool]] = {}
+        # keys of the signal callbacks disconnected from this instance
+        self._muted: set[Hashable] = set()
+        # All the callbacks to call on emission and whether they take the
+        # value, rebuilt when the signal version differs from `_version`.
+        self._funcs: tuple[Callable[..., Any], ...] = ()
+        self._takes: tuple[bool, ...] = ()
+        self._version: int | None = None
+
+    def _rebuild(self) -> None:
+        signal = self._signal
+        cache = self._bound_cache
+        muted = self._muted
+        new_cache = {}
+        still_muted = set()
+        funcs = []
+        takes = []
+
+        for func, bind in signal._cbs:
+            cache_key = (id(func), bind)
+            entry = cache.get(cache_key)
+
+            if entry is None:
+                target = _bind_method(func, self.obj) if bind else func
+                entry = (func, target, _takes_arg(target))
+
+            new_cache[cache_key] = entry
+
+            if muted:
+                key = _callback_key(entry[1])
+                if key in muted:
+                    still_muted.add(key)
+                    continue
+
+            funcs.append(entry[1])
+            takes.append(entry[2])
+
+        funcs.extend(self._conn_cbs.values())
+        takes.extend(self._conn_takes.values())
+        self._bound_cache = new_cache
+        self._muted = still_muted
+        self._funcs = tuple(funcs)
+        self._takes = tuple(takes)
+        self._version = signal._version
 
     @overload
     def emit(self) -> None: ...
     @overload
     def emit(self, value: VT, /) -> None: ...
     def emit(self, *args) -> None:
-        import inspect
-
         if len(args) > 1:
             raise TypeError("too many arguments for emit")
 
-        for func in self._cb_list:
-            try:
-                params = inspect.signature(func).parameters
-            except TypeError:
-                continue
+        if self._version != self._signal._version:
+            self._rebuild()
 
-            if params:
-                value = args[:1] # 0 or 1 arg
-            else:
-                value = ()
+        value = args[:1] # 0 or 1 arg
+        empty = ()
 
-            func(*value)
+        for func, takes in zip(self._funcs, self._takes):
+            func(*(value if takes else empty))
+
+    def emit_many(self, values: Iterable[VT], /) -> None:
+        """Emit a batch of values. Each callback receives all the values
+        before the next one is called."""
+        values = tuple(values)
+
+        if self._version != self._signal._version:
+            self._rebuild()
+
+        for func, takes in zip(self._funcs, self._takes):
+            if takes:
+                for value in values:
+                    func(value)
+            else:
+                for _ in values:
+                    func()
 
     def connect[R](self, target: Callable[..., R], /):
-        self._cb_list.append(target)
+        """Connect a callable to the signal of this instance. A callable can
+        be connected only once, connecting it again has no effect."""
+        key = _callback_key(target)
+
+        if key not in self._conn_cbs:
+            self._conn_cbs[key] = target
+            self._conn_takes[key] = _takes_arg(target)
+            self._version = None
+
         return target
 
     def disconnect[R](self, target: Callable[..., R], /):
-        try:
-            self._cb_list.remove(target)
-        except ValueError:
-            pass
+        """Disconnect a callable from the signal of this instance. Callbacks
+        bound to the signal itself are muted for this instance only."""
+        key = _callback_key(target)
+
+        if self._conn_cbs.pop(key, None) is not None:
+            del self._conn_takes[key]
+            self._version = None
+            return target
+
+        if self._version != self._signal._version:
+            self._rebuild()
+
+        for _, bound, _ in self._bound_cache.values():
+            if _callback_key(bound) == key:
+                self._muted.add(key)
+                self._version = None
+                break
+
         return target
 
 
 class Signal[T, VT](immutable_property[T, _Emitter[VT]]):
+    __slots__ = ('_cbs', '_version', 'dtype')
+
     def __init__(self, dtype: type[VT] | None = None, /):
-        super().__init__(lambda obj: _Emitter(obj, self._cb_m, self._cb_f))
-        self._cb_m = []
-        self._cb_f = []
+        super().__init__(None)
+        # (callback, whether it is a descriptor to bind) in binding order
+        self._cbs: list[tuple[Any, bool]] = []
+        self._version = 0 # bumped on every change of the callbacks
         self.dtype = dtype
 
     def __set__(self, instance: T, value):
         raise TypeError("can not assign to signals")
 
+    def _make_default(self, obj: T, /) -> _Emitter[VT]:
+        return _Emitter(obj, self)
+
     def bindm[V](self, func: V, /) -> V:
         """Binds a descriptor to the signal. The descriptor supports
         `__get__` returning a callable."""
-        if not hasattr(func, "__get__"):
+        if not hasattr(type(func), "__get__"): # as the descriptor protocol does
             raise TypeError(f"{func!r} is not a descriptor")
-        self._cb_m.append(func)
+        self._cbs.append((func, True))
+        self._version += 1
         return func
 
     def unbindm[V](self, func: V, /) -> V:
-        self._cb_m.remove(func)
+        self._unbind(func, True)
         return func
 
     def bindf[R](self, func: Callable[[VT], R], /):
         """A decorator that binds a callable to the signal."""
         if not callable(func):
             raise TypeError(f"{func!r} is not callable")
-        self._cb_f.append(func)
+        self._cbs.append((func, False))
+        self._version += 1
         return func
 
     def unbindf[R](self, func: Callable[[VT], R], /):
-        self._cb_f.remove(func)
+        self._unbind(func, False)
         return func
 
+    def _unbind(self, func, bind: bool, /) -> None:
+        # Match by identity, so that no user-defined __eq__ is called.
+        key = _callback_key(func)
+
+        for idx, (f, is_desc) in enumerate(self._cbs):
+            if is_desc is bind and _callback_key(f) == key:
+                del self._cbs[idx]
+                self._version += 1
+                return
+
+        raise ValueError(f"{func!r} is not bound to the signal")
+
 
 # Here we use Callable instead of SupportsGet for a better type deduction.
 def signalmethod[T, V](func: Callable[[T, V], Any], /) -> Signal[T, V]:
@@ -279,16 +604,27 @@ def signalmethod[T, V](func: Callable[[T, V], Any], /) -> Signal[T, V]:
 # External Methods
 # ------------------------------
 
+def _name_of(obj: Any, /) -> str:
+    if hasattr(obj, "__name__"):
+        return obj.__name__
+    elif hasattr(obj, "__qualname__"):
+        return obj.__qualname__
+    else:
+        return type(obj).__name__
+
+
 class declare[T, **P, R]:
     """Declare the signature of a method and subsequently provide
     its implementation."""
-    __slots__ = ("__name__", "__stub__", "__func__")
+    __slots__ = ("__name__", "__stub__", "__func__", "_func_has_get", "_stub_name")
     __name__: str | None
 
     def __init__(self, stub: Callable[Concatenate[T, P], R], /):
         self.__name__ = None
         self.__stub__ = stub
         self.__func__ = None
+        self._func_has_get = False
+        self._stub_name = _name_of(stub)
 
     def __set_name__(self, owner: type[T], name: str) -> None:
         if self.__name__ is None:
@@ -299,15 +635,6 @@ class declare[T, **P, R]:
                 f"({self.__name__!r} and {name!r})."
             )
 
-    def _get_name_of_stub(self) -> str:
-        if hasattr(self.__stub__, "__name__"):
-            return self.__stub__.__name__
-        elif hasattr(self.__stub__, "__qualname__"):
-            return self.__stub__.__qualname__
-        else:
-            stub_type = type(self.__stub__)
-            return stub_type.__name__
-
     @overload
     def __get__(self, instance: T, owner: type[T]) -> Callable[P, R]: ...
     @overload
@@ -322,8 +649,8 @@ class declare[T, **P, R]:
                 f"{self.__name__!r} in {owner.__name__!r}."
             )
 
-        if hasattr(self.__func__, "__get__"):
-            return self.__func__.__get__(instance, owner)
+        if self._func_has_get:
+            return _bind_method(self.__func__, instance)
         else:
             return self.__func__
 
@@ -345,19 +672,23 @@ class declare[T, **P, R]:
             # if implement for subclasses: copy is needed for override
             new_ext = declare(self.__stub__)
             new_ext.__name__ = self.__name__
-            new_ext.__func__ = func
+            new_ext._set_func(func)
             setattr(owner, self.__name__, new_ext)
             return func
 
         if self.__func__ is None:
-            self.__func__ = func
+            self._set_func(func)
             return func
 
         # if already implemented
         raise TypeError(
-            f"function {self._get_name_of_stub()!r} "
+            f"function {self._stub_name!r} "
             "has already been implemented"
             if owner is None else
             f"method {self.__name__!r} of class {owner.__name__!r} "
             "has already been implemented"
         )
+
+    def _set_func(self, func, /) -> None:
+        self.__func__ = func
+        self._func_has_get = hasattr(type(func), "__get__")